@@ -1,18 +1,98 @@
 import os
 import time
+import asyncio
 import logging
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import operator
+import types
+import orjson # Fast C-backed JSON, replaces stdlib json inside the SDK below
+import requests
+from requests.adapters import HTTPAdapter
+# Pin eth_hash to pycryptodome's C Keccak (already a dependency) before anything imports eth_utils/eth_account,
+# instead of leaving it to import-order-dependent auto-detection. Can still be overridden from the environment.
+os.environ.setdefault("ETH_HASH_BACKEND", "pycryptodome")
 from eth_account import Account # Part of eth-account, often installed with web3py
 from eth_account.signers.local import LocalAccount # Correct import path
+from eth_account.messages import SignableMessage
+from eth_utils import keccak, to_hex
 from hyperliquid.info import Info
 from hyperliquid.exchange import Exchange
-from hyperliquid.utils import constants
+from hyperliquid.utils.constants import MAINNET_API_URL, TESTNET_API_URL
+import hyperliquid.api as hlapi
+import hyperliquid.websocket_manager as hlws
+from hyperliquid.websocket_manager import WebsocketManager
+import hyperliquid.exchange as hlexchange
+from hyperliquid.utils.signing import action_hash
+
+# --- Fast JSON for the SDK ---
+# REST: API.post (shared by Info and Exchange) sends `json=payload` and returns `response.json()`, both of
+# which go through requests' own json module. Replace it with an orjson-based version with the same behavior.
+def _orjson_api_post(self, url_path: str, payload=None):
+    payload = payload or {}
+    url = self.base_url + url_path
+    response = self.session.post(url, data=orjson.dumps(payload), headers={"Content-Type": "application/json"})
+    self._handle_exception(response)
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return {"error": f"Could not parse JSON: {response.text}"}
+
+hlapi.API.post = _orjson_api_post
+
+# WebSocket messages and 4xx error bodies: the SDK modules call json.loads/json.dumps on their module-level
+# `json` name. Rebind that name to an orjson-backed namespace instead of patching the stdlib module itself,
+# so other libraries (requests, eth_account, ...) keep the real json.
+_ORJSON_SHIM = types.SimpleNamespace(
+    loads=orjson.loads,
+    dumps=lambda obj, **kwargs: orjson.dumps(obj).decode(), # orjson returns bytes, SDK expects str
+    JSONDecodeError=orjson.JSONDecodeError, # Subclass of json.JSONDecodeError
+)
+hlapi.json = _ORJSON_SHIM
+hlws.json = _ORJSON_SHIM
+
+# --- Signer ---
+
+class CachedKeyAccount(LocalAccount):
+    """LocalAccount that signs with its already-parsed key object."""
+    def sign_message(self, signable_message):
+        # LocalAccount passes the raw key bytes, so Account rebuilds an eth_keys PrivateKey
+        # (backend lookup + public key derivation) on every order/cancel signature. Reuse ours.
+        return self._publicapi.sign_message(signable_message, private_key=self._key_obj)
+
+# --- Precomputed EIP-712 pieces for L1 actions (orders, cancels) ---
+# The SDK's sign_l1_action rebuilds the full typed-data dict and lets eth_account re-hash the constant
+# domain and type strings on every call. Everything but the per-action connectionId is fixed, so hash it once.
+# Must match hyperliquid.utils.signing.l1_payload.
+L1_DOMAIN_SEPARATOR = keccak(
+    keccak(b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)")
+    + keccak(b"Exchange")
+    + keccak(b"1")
+    + (1337).to_bytes(32, "big") # chainId
+    + bytes(32) # verifyingContract = zero address
+)
+AGENT_TYPE_HASH = keccak(b"Agent(string source,bytes32 connectionId)")
+AGENT_SOURCE_HASH = {True: keccak(b"a"), False: keccak(b"b")} # is_mainnet -> hashed phantom agent source
+
+def fast_sign_l1_action(wallet, action, active_pool, nonce, expires_after, is_mainnet):
+    """Drop-in for the SDK's sign_l1_action that reuses the precomputed domain separator."""
+    connection_id = action_hash(action, active_pool, nonce, expires_after)
+    struct_hash = keccak(AGENT_TYPE_HASH + AGENT_SOURCE_HASH[is_mainnet] + connection_id)
+    signed = wallet.sign_message(SignableMessage(b"\x01", L1_DOMAIN_SEPARATOR, struct_hash))
+    return {"r": to_hex(signed["r"]), "s": to_hex(signed["s"]), "v": signed["v"]}
+
+hlexchange.sign_l1_action = fast_sign_l1_action # Exchange imported the name directly, so rebind it there
 
 # --- Configuration & Security ---
 
 # **NEVER HARDCODE PRIVATE KEYS** - Use environment variables or a secure config manager
 # Set this environment variable before running: export HL_TESTNET_KEY="0xyour_private_key"
 TESTNET_PRIVATE_KEY = os.environ.get("HL_TESTNET_KEY") 
-TESTNET_RPC_URL = constants.TESTNET_API_URL # Use SDK constant for Testnet URL
+TESTNET_RPC_URL = TESTNET_API_URL # Use SDK constant for Testnet URL
+# URL safety flags, evaluated once at import and checked before main() runs
+IS_MAINNET_LEAK = MAINNET_API_URL in TESTNET_RPC_URL # The mainnet URL has no "mainnet" in it, so compare against it
+IS_TESTNET = "testnet" in TESTNET_RPC_URL.casefold()
 
 # Check if the private key is loaded
 if not TESTNET_PRIVATE_KEY:
@@ -22,9 +102,10 @@ if not TESTNET_PRIVATE_KEY.startswith("0x"):
 
 # Create account object from private key
 try:
-    ACCOUNT: LocalAccount = Account.from_key(TESTNET_PRIVATE_KEY)
+    _parsed_account = Account.from_key(TESTNET_PRIVATE_KEY)
+    ACCOUNT: LocalAccount = CachedKeyAccount(_parsed_account._key_obj, _parsed_account._publicapi)
     TESTNET_WALLET_ADDRESS = ACCOUNT.address
-    print(f"Loaded Testnet account: {TESTNET_WALLET_ADDRESS}")
+    print(f"Loaded Testnet account: {TESTNET_WALLET_ADDRESS} (signing backend: {type(ACCOUNT._key_obj.backend).__name__})")
 except Exception as e:
     print(f"Error loading private key: {e}. Ensure it's a valid 64-char hex key.")
     exit()
@@ -34,37 +115,126 @@ except Exception as e:
 ASSET_SYMBOL = "BTC" # Asset to trade
 ORDER_SIZE_BTC = 0.0001 # Keep this VERY small on testnet
 PRICE_OFFSET_USD = 10.0 # Place buy order $10 below mid-price
+PRICE_DECIMALS = 2 # Price precision used for BTC/USD limit prices
+TICKS_PER_USD = 10 ** PRICE_DECIMALS # Prices are computed as integer ticks of 1 / TICKS_PER_USD
+PRICE_OFFSET_TICKS = round(PRICE_OFFSET_USD * TICKS_PER_USD)
 ORDER_TYPE = "limit" # We want a limit order
 TIME_IN_FORCE = "Gtc" # Good Til Canceled (standard for limit)
 SLIPPAGE_TOLERANCE = 0.01 # Example: 1% (More relevant for market orders, but good practice)
 
 # --- Logging Setup ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Records are only enqueued on the calling thread; a background listener does the stderr writes,
+# so order placement/cancellation never blocks on terminal I/O.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s')) # Only merge args here; the listener adds the prefix
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler], force=True)
+_log_listener.start()
+atexit.register(_log_listener.stop) # Flushes records still in the queue on exit
+
+_get_px = operator.itemgetter('px') # Price field of an order book level
+
+# --- WebSocket State ---
+# Updated from the SDK's WebSocket thread by the callbacks below, read by the event loop in main().
+latest_mid: dict[str, float] = {} # asset -> latest mid-price from the l2Book stream
+order_state: dict[int, str] = {} # oid -> latest orderUpdates status ("open", "filled", "canceled", ...)
+order_fills: dict[int, list[dict]] = {} # oid -> fills seen on userEvents (may be partial)
+order_done: dict[int, asyncio.Event] = {} # oid -> set once the order has left the book
+# Every other orderUpdates status (filled, canceled, *Canceled, *Rejected, scheduledCancel, ...) means the order left the book
+ORDER_LIVE_STATUSES = {"open", "triggered"}
+main_loop: asyncio.AbstractEventLoop | None = None # Loop that owns the events above, set by main()
+
+def _order_done_event(oid: int) -> asyncio.Event:
+    """Returns the event that is set once the given order leaves the book."""
+    return order_done.setdefault(oid, asyncio.Event())
+
+def _record_order_state(oid: int, status: str) -> None:
+    order_state[oid] = status
+    if status not in ORDER_LIVE_STATUSES and main_loop is not None and not main_loop.is_closed():
+        # asyncio.Event is not thread-safe: hand the set() over to the loop's thread
+        main_loop.call_soon_threadsafe(_order_done_event(oid).set)
+
+def on_book_msg(msg: dict) -> None:
+    """l2Book callback: keeps latest_mid current for the subscribed asset."""
+    book = msg["data"]
+    levels = book["levels"]
+    if len(levels) >= 2 and levels[0] and levels[1]:
+        latest_mid[book["coin"]] = (float(_get_px(levels[0][0])) + float(_get_px(levels[1][0]))) * 0.5
+
+def on_user_msg(msg: dict) -> None:
+    """userEvents callback: records fills per OID (informational only)."""
+    # A fill can be partial, so it never marks the order as done - only orderUpdates does that.
+    for fill in msg["data"].get("fills", []):
+        order_fills.setdefault(fill["oid"], []).append(fill)
+
+def on_order_update_msg(msg: dict) -> None:
+    """orderUpdates callback: tracks every status transition (open, filled, canceled, ...)."""
+    for update in msg["data"]:
+        _record_order_state(update["order"]["oid"], update["status"])
 
 # --- Helper Functions ---
 
-def get_market_mid_price(info_client: Info, asset: str) -> float | None:
-    """Fetches the order book and calculates the mid-price."""
-    logging.info(f"Fetching order book for {asset}...")
+def create_http_session() -> requests.Session:
+    """Creates a keep-alive HTTP session to be shared by all SDK clients."""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"}) # Same header the SDK sets on its own sessions
+    # Small pool is plenty: the bot only talks to one host. No retries - orders must not be resent blindly.
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    return session
+
+def share_http_session(session: requests.Session, *clients) -> None:
+    """Points every SDK client (they all subclass hyperliquid.api.API) at the same session."""
+    for client in clients:
+        if client.session is not session:
+            client.session.close() # Drop the per-client pool the SDK created in its constructor
+        client.session = session
+
+def fetch_pre_trade_state(info_client: Info, asset: str, user_address: str) -> tuple[dict | None, dict | None]:
+    """Fetches the order book and the user's clearinghouse state in one batched /info POST ((None, None) if rejected)."""
+    logging.info("Fetching order book for %s and user state (batched)...", asset)
+    batch = [
+        {"type": "l2Book", "coin": asset},
+        {"type": "clearinghouseState", "user": user_address},
+    ]
     try:
-        order_book = info_client.order_book(asset)
-        if order_book and order_book.get('levels') and len(order_book['levels']) >= 2:
-            # Levels are typically [bid_levels, ask_levels]
-            best_bid = float(order_book['levels'][0][0]['px']) # First bid level, price
-            best_ask = float(order_book['levels'][1][0]['px']) # First ask level, price
-            mid_price = (best_bid + best_ask) / 2
-            logging.info(f"Best Bid: {best_bid}, Best Ask: {best_ask}, Mid Price: {mid_price}")
+        results = info_client.post("/info", batch)
+        if isinstance(results, list) and len(results) == len(batch):
+            return results[0], results[1]
+        logging.warning("Batched /info request not supported (response: %s). Falling back to fetching the order book only.", results)
+    except Exception as e:
+        logging.warning("Batched /info request failed: %s. Falling back to fetching the order book only.", e)
+
+    # Fallback: the user state is only logged, so don't spend an extra round trip on it.
+    # The book is left to get_market_mid_price so it is fetched exactly once.
+    return None, None
+
+def get_market_mid_price(info_client: Info, asset: str, order_book: dict | None = None) -> float | None:
+    """Calculates the mid-price from the order book, fetching it first if not supplied."""
+    try:
+        if order_book is None:
+            logging.info("Fetching order book for %s...", asset)
+            order_book = info_client.l2_snapshot(asset)
+        levels = order_book.get('levels') if order_book else None
+        if levels and len(levels) >= 2:
+            # Levels are typically [bid_levels, ask_levels]; first entry of each is the best price
+            best_bid_px, best_ask_px = _get_px(levels[0][0]), _get_px(levels[1][0])
+            best_bid, best_ask = float(best_bid_px), float(best_ask_px)
+            mid_price = (best_bid + best_ask) * 0.5
+            logging.info("Best Bid: %s, Best Ask: %s, Mid Price: %s", best_bid, best_ask, mid_price)
             return mid_price
         else:
             logging.warning("Order book data incomplete or missing levels.")
             return None
     except Exception as e:
-        logging.error(f"Error fetching or parsing order book for {asset}: {e}")
+        logging.error("Error fetching or parsing order book for %s: %s", asset, e)
         return None
 
 def place_limit_order(exchange_client: Exchange, asset: str, side: str, size: float, limit_px: float):
     """Places a limit order using the Exchange client."""
-    logging.info(f"Attempting to place {side} order: {size} {asset} @ {limit_px:.2f}")
+    logging.info("Attempting to place %s order: %s %s @ %s", side, size, asset, limit_px) # limit_px is already quantized
     try:
         # SDK's order function likely takes asset index, check SDK examples/docs
         # For simplicity, assuming SDK handles symbol mapping or direct symbol use
@@ -77,102 +247,144 @@ def place_limit_order(exchange_client: Exchange, asset: str, side: str, size: fl
             order_type={"limit": {"tif": TIME_IN_FORCE}},
             # cloid=None # Optional client order ID
         )
-        logging.info(f"Order placement result: {order_result}")
+        logging.info("Order placement result: %s", order_result)
 
         # Check response structure based on SDK docs/examples
         if order_result and order_result.get("status") == "ok":
             # Extract the order ID (oid) - structure might vary!
-            statuses = order_result.get("response", {}).get("data", {}).get("statuses", [])
-            if statuses and isinstance(statuses[0], dict) and "resting" in statuses[0]:
-                 oid = statuses[0]["resting"]["oid"]
-                 logging.info(f"Successfully placed order with OID: {oid}")
-                 return oid
-            elif statuses and isinstance(statuses[0], dict) and "filled" in statuses[0]:
-                 logging.info("Order filled immediately upon placement.")
-                 # May not get a resting OID if fully filled instantly
-                 return None # Indicate it didn't rest
-            else:
-                 logging.warning("Order placed but couldn't extract resting OID from response.")
-                 return None
+            try:
+                status0 = order_result["response"]["data"]["statuses"][0]
+                if "resting" in status0:
+                     oid = status0["resting"]["oid"]
+                     logging.info("Successfully placed order with OID: %s", oid)
+                     return oid
+                if "filled" in status0:
+                     logging.info("Order filled immediately upon placement.")
+                     # May not get a resting OID if fully filled instantly
+                     return None # Indicate it didn't rest
+            except (KeyError, IndexError, TypeError):
+                pass # Unexpected shape - handled below
+            logging.warning("Order placed but couldn't extract resting OID from response.")
+            return None
         else:
-            logging.error(f"Order placement failed or status not 'ok'. Response: {order_result}")
+            logging.error("Order placement failed or status not 'ok'. Response: %s", order_result)
             return None
             
     except Exception as e:
-        logging.error(f"Exception during order placement: {e}")
+        logging.error("Exception during order placement: %s", e)
         return None
 
+def get_open_orders_by_oid(info_client: Info, user_address: str) -> dict[int, dict]:
+    """Fetches all of the user's resting orders in one call, keyed by OID."""
+    return {order['oid']: order for order in info_client.open_orders(user_address)}
+
 def get_order_status(info_client: Info, user_address: str, oid: int) -> dict | None:
-    """Queries the status of a specific order by OID."""
-    logging.info(f"Querying status for order OID: {oid}")
+    """Looks up a specific order by OID among the user's open orders."""
+    logging.info("Querying status for order OID: %s", oid)
     try:
-        # Need to find the correct function in SDK - might be part of user_state or a specific query
-        # Hypothetical function name, replace with actual SDK function:
-        order_data = info_client.query_order_by_oid(user_address, oid) 
-        # Or might need to iterate through info_client.open_orders(user_address)
+        order_data = get_open_orders_by_oid(info_client, user_address).get(oid)
         
         if order_data:
-            logging.info(f"Order OID {oid} status data: {order_data}")
-            # Return the relevant part of the status (structure depends on SDK)
-            return order_data # Adjust based on actual return structure
+            logging.info("Order OID %s status data: %s", oid, order_data)
+            return order_data # Still resting: the open order entry (coin, side, limitPx, sz, ...)
         else:
-            logging.warning(f"Could not find status for order OID: {oid}. It might be filled or canceled.")
+            # Expected when the concurrent cancel in run_cycle lands first, so not a warning
+            logging.info("Order OID %s not among open orders. It might be filled or canceled.", oid)
             return None
     except Exception as e:
-        logging.error(f"Exception querying order status for OID {oid}: {e}")
+        logging.error("Exception querying order status for OID %s: %s", oid, e)
         return None
         
 def cancel_order(exchange_client: Exchange, asset: str, oid: int):
     """Cancels an order using its OID."""
-    logging.info(f"Attempting to cancel order OID: {oid} for asset {asset}")
+    logging.info("Attempting to cancel order OID: %s for asset %s", oid, asset)
     try:
         # Assuming asset symbol is needed along with OID
         cancel_result = exchange_client.cancel(asset, oid)
-        logging.info(f"Cancellation result for OID {oid}: {cancel_result}")
+        logging.info("Cancellation result for OID %s: %s", oid, cancel_result)
         
         # Check response structure based on SDK docs/examples
         if cancel_result and cancel_result.get("status") == "ok":
-            logging.info(f"Successfully submitted cancellation for OID: {oid}")
+            logging.info("Successfully submitted cancellation for OID: %s", oid)
             return True
         else:
-            logging.error(f"Cancellation failed or status not 'ok' for OID {oid}. Response: {cancel_result}")
+            logging.error("Cancellation failed or status not 'ok' for OID %s. Response: %s", oid, cancel_result)
             return False
             
     except Exception as e:
-        logging.error(f"Exception during order cancellation for OID {oid}: {e}")
+        logging.error("Exception during order cancellation for OID %s: %s", oid, e)
         return False
 
 # --- Main Bot Logic ---
-def main():
+async def main():
+    global main_loop
     logging.info("--- Starting Simple Hyperliquid Bot (Testnet) ---")
+    main_loop = asyncio.get_running_loop() # Must be set before subscribing so callbacks can reach it
     
     # Initialize SDK clients
     try:
-        info = Info(constants.TESTNET_API_URL, skip_ws=True) # Skip WebSocket for this simple example
-        # The Exchange client needs the signer (Account object)
-        exchange = Exchange(ACCOUNT, constants.TESTNET_API_URL) 
-        logging.info("Hyperliquid SDK clients initialized for Testnet.")
+        # skip_ws: Info would start the WebSocket thread before its own REST calls, leaking it if they fail.
+        # It is attached below instead, inside the try/finally that stops it.
+        info = Info(TESTNET_RPC_URL, skip_ws=True)
     except Exception as e:
-        logging.error(f"Failed to initialize SDK clients: {e}")
+        logging.error("Failed to initialize SDK clients: %s", e)
         return
 
-    # 1. Get Mid Price
-    mid_price = get_market_mid_price(info, ASSET_SYMBOL)
+    # The WebSocket threads are not daemons - stop them on every exit path or the process never exits
+    try:
+        try:
+            info.ws_manager = WebsocketManager(info.base_url) # WebSocket pushes mid-price and order updates
+            info.ws_manager.start()
+            # The Exchange client needs the signer (Account object)
+            exchange = Exchange(ACCOUNT, TESTNET_RPC_URL) 
+            # Reuse one TCP/TLS connection for every REST call instead of one pool per client.
+            # Exchange keeps its own internal Info (used for name -> asset lookups), so share with it too.
+            session = create_http_session()
+            share_http_session(session, info, exchange, exchange.info)
+            info.subscribe({"type": "l2Book", "coin": ASSET_SYMBOL}, on_book_msg)
+            info.subscribe({"type": "userEvents", "user": TESTNET_WALLET_ADDRESS}, on_user_msg)
+            info.subscribe({"type": "orderUpdates", "user": TESTNET_WALLET_ADDRESS}, on_order_update_msg)
+            logging.info("Hyperliquid SDK clients initialized for Testnet.")
+        except Exception as e:
+            logging.error("Failed to initialize SDK clients: %s", e)
+            return
+
+        await run_cycle(info, exchange)
+    finally:
+        if info.ws_manager is not None:
+            info.disconnect_websocket()
+
+    logging.info("--- Bot cycle finished ---")
+
+async def run_cycle(info: Info, exchange: Exchange):
+    """Runs one place -> wait -> cancel cycle."""
+    # 1. Get Mid Price (order book and account state fetched together to save a round trip)
+    order_book, user_state = fetch_pre_trade_state(info, ASSET_SYMBOL, TESTNET_WALLET_ADDRESS)
+    if user_state:
+        logging.info("Account value: %s, Withdrawable: %s", user_state.get('marginSummary', {}).get('accountValue'), user_state.get('withdrawable'))
+    # Prefer the streamed mid; the batched snapshot covers the window before the first l2Book message arrives
+    mid_price = latest_mid.get(ASSET_SYMBOL)
+    if mid_price is not None:
+        logging.info("Mid Price (WebSocket): %s", mid_price)
+    else:
+        mid_price = get_market_mid_price(info, ASSET_SYMBOL, order_book)
     if mid_price is None:
         logging.error("Could not determine mid-price. Exiting.")
         return
         
     # 2. Calculate Limit Price & Define Order
     # Place a BUY order slightly below mid-price
-    limit_buy_price = round(mid_price - PRICE_OFFSET_USD, 2) # Round to appropriate precision for BTC/USD
+    # Quantize to integer ticks once; exact integer arithmetic avoids float rounding noise in the offset
+    limit_ticks = round(mid_price * TICKS_PER_USD) - PRICE_OFFSET_TICKS
+    limit_buy_price = limit_ticks / TICKS_PER_USD # Single conversion back - the SDK signs floats
     order_side = "buy"
     
     # --- Strict Risk Check ---
-    if limit_buy_price <= 0:
-        logging.error(f"Calculated limit price ({limit_buy_price}) is zero or negative. Aborting.")
+    if limit_ticks <= 0:
+        logging.error("Calculated limit price (%s) is zero or negative. Aborting.", limit_buy_price)
         return
     if ORDER_SIZE_BTC <= 0:
-         logging.error(f"Order size ({ORDER_SIZE_BTC}) is zero or negative. Aborting.")
+         logging.error("Order size (%s) is zero or negative. Aborting.", ORDER_SIZE_BTC)
          return
 
     # 3. Place Order
@@ -180,47 +392,55 @@ def main():
 
     # 4. Monitor & Cancel Logic
     if placed_order_id is not None:
-        logging.info(f"Waiting a few seconds before checking/canceling order {placed_order_id}...")
-        time.sleep(10) # Wait time
-
-        # 5. Check Status (Optional but good practice)
-        order_status = get_order_status(info, TESTNET_WALLET_ADDRESS, placed_order_id)
-        # Log status if found, otherwise proceed to cancel anyway
+        logging.info("Waiting up to 10 seconds for order %s to fill before canceling...", placed_order_id)
+        # Wakes early if the user streams report the order left the book (filled, canceled, ...)
+        wait_start = time.monotonic()
+        try:
+            await asyncio.wait_for(_order_done_event(placed_order_id).wait(), timeout=10)
+            logging.info("Order %s left the book after %.2fs.", placed_order_id, time.monotonic() - wait_start)
+        except asyncio.TimeoutError:
+            pass # Still resting - fall through to cancel
 
-        # 6. Attempt Cancellation
-        cancel_success = cancel_order(exchange, ASSET_SYMBOL, placed_order_id)
+        # 5. Check Status (Optional but good practice) - pushed over WebSocket when available
+        status = order_state.get(placed_order_id)
+        if placed_order_id in order_fills:
+            logging.info("Order OID %s received %s fill(s) (WebSocket).", placed_order_id, len(order_fills[placed_order_id]))
+        if status is not None:
+            logging.info("Order OID %s status (WebSocket): %s", placed_order_id, status)
+            if status not in ORDER_LIVE_STATUSES:
+                logging.info("Order %s is no longer resting (%s). Nothing to cancel.", placed_order_id, status)
+                return
+            # 6. Attempt Cancellation
+            cancel_success = await asyncio.to_thread(cancel_order, exchange, ASSET_SYMBOL, placed_order_id)
+        else:
+            # 5+6. Nothing pushed: the cancel doesn't depend on the status, so run both REST calls concurrently.
+            # The status query may land after the cancel, so a "not found"/canceled status here is expected.
+            _, cancel_success = await asyncio.gather(
+                asyncio.to_thread(get_order_status, info, TESTNET_WALLET_ADDRESS, placed_order_id),
+                asyncio.to_thread(cancel_order, exchange, ASSET_SYMBOL, placed_order_id),
+            )
         if cancel_success:
-             logging.info(f"Order {placed_order_id} cancellation submitted successfully.")
+             logging.info("Order %s cancellation submitted successfully.", placed_order_id)
         else:
-             logging.warning(f"Could not confirm cancellation for order {placed_order_id}. Check manually.")
+             logging.warning("Could not confirm cancellation for order %s. Check manually.", placed_order_id)
              
     elif placed_order_id is None and limit_buy_price is not None:
          # Handle case where order might have filled instantly or failed to place
          logging.info("Order did not receive a resting OID (might be filled instantly or failed). Checking open orders...")
          try:
-             open_orders = info.open_orders(TESTNET_WALLET_ADDRESS)
-             logging.info(f"Current open orders: {open_orders}")
+             open_orders_by_oid = get_open_orders_by_oid(info, TESTNET_WALLET_ADDRESS)
+             logging.info("Current open orders: %s", list(open_orders_by_oid.values()))
              # Add logic here to see if an unexpected order matching parameters exists and try to cancel if needed
          except Exception as e:
-             logging.error(f"Could not check open orders after placement: {e}")
+             logging.error("Could not check open orders after placement: %s", e)
              
     else:
         logging.error("Order placement failed. No OID received.")
 
-    logging.info("--- Bot cycle finished ---")
-
 
 if __name__ == "__main__":
     # --- Final Safety Check ---
-    if constants.MAINNET_API_URL in TESTNET_RPC_URL:
-         logging.error("CRITICAL ERROR: Attempting to use Mainnet URL in Testnet configuration!")
-    elif "testnet" not in TESTNET_RPC_URL.lower():
-         logging.warning("Warning: Configured RPC URL does not explicitly contain 'testnet'. Double-check it's correct.")
-         # Add a confirmation step or exit if unsure
-         # confirm = input(f"Using RPC URL: {TESTNET_RPC_URL}. Continue? (yes/no): ")
-         # if confirm.lower() != 'yes':
-         #     print("Exiting.")
-         #     exit()
-    else:
-        main()
-        
\ No newline at end of file
+    # Asserts are stripped by `python -O`: do not run the bot with -O if you rely on this guard.
+    assert not IS_MAINNET_LEAK, "CRITICAL ERROR: Attempting to use Mainnet URL in Testnet configuration!"
+    assert IS_TESTNET, "Configured RPC URL does not explicitly contain 'testnet'. Double-check it's correct."
+    asyncio.run(main())